@@ -1,12 +1,17 @@
 # backend/api.py
 from fastapi import FastAPI, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
 from .data_processing import load_file, detect_column_types
 from .insights import generate_rule_based_insights, generate_llm_summary
-from .forecasting import forecast_time_series
+from .pipeline import validate_spec, run_forecast, iter_dashboard_sections, run_dashboard_pipeline
 from .agent.gemini_agent import analyze_text_or_table  # ← NEW
 import pandas as pd
 import tempfile
+import json
+import math
 import uvicorn
 
 app = FastAPI(title="Custom Dashboard Generator API")
@@ -66,20 +71,77 @@ async def forecast(
     except Exception as e:
         return {"error": f"Failed to load file: {e}"}
     numeric, categorical, datetime_cols, df_clean = detect_column_types(df)
-    if not date_col and datetime_cols:
-        date_col = datetime_cols[0]
-    if not value_col and numeric:
-        value_col = numeric[0]
-    if not date_col or not value_col:
-        return {"error": "Need a date column and a numeric column to forecast."}
+    return run_forecast(df_clean, numeric, datetime_cols, date_col, value_col, periods=periods)
+
+def _drop_nan(obj):
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _drop_nan(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_drop_nan(v) for v in obj]
+    return obj
+
+def _json_safe(obj):
+    """
+    jsonable_encoder plus NaN/inf -> None, since neither JSONResponse nor NDJSON accepts them.
+    """
+    return _drop_nan(jsonable_encoder(obj))
+
+@app.post("/dashboard")
+async def dashboard(
+    file: UploadFile = File(...),
+    spec: str = Form(None),
+    stream: bool = Form(False)
+):
+    """
+    Build a whole dashboard from one upload: the file is parsed and type-detected once,
+    then insights, forecasts and chart aggregations run concurrently on the shared frame.
+    'spec' is JSON, e.g.
+    {"insights": {"use_llm": false},
+     "forecasts": [{"date_col": "Date", "value_col": "Sales", "periods": 6}],
+     "charts": [{"type": "bar", "x": "Region", "y": "Sales"}]}
+    Charts take type (line/bar/pie/scatter), x, y (numeric), optional color and top.
+    Omit a key (or set it to null / []) to skip that stage; no spec runs the defaults.
+    With stream=true the response is NDJSON, one {section, index, result} line per
+    section as it finishes (summary first; index is null for summary and insights).
+    """
     try:
-        hist, forecast_df = forecast_time_series(df_clean, date_col, value_col, periods=periods)
-        return {
-            "historical": hist.to_dict(orient="records"),
-            "forecast": forecast_df.to_dict(orient="records")
-        }
+        spec_dict = json.loads(spec) if spec else None
+    except ValueError as e:
+        return {"error": f"Invalid spec: {e}"}
+    if spec_dict is not None:
+        spec_error = validate_spec(spec_dict)
+        if spec_error:
+            return {"error": f"Invalid spec: {spec_error}"}
+    # parsing and the pipeline are blocking; keep them off the event loop
+    try:
+        df = await run_in_threadpool(load_file, file)
     except Exception as e:
-        return {"error": f"Forecast failed: {e}"}
+        return {"error": f"Failed to load file: {e}"}
+    numeric, categorical, datetime_cols, df_clean = await run_in_threadpool(detect_column_types, df)
+    summary = {
+        "columns": df_clean.columns.tolist(),
+        "numeric": numeric,
+        "categorical": categorical,
+        "datetime": datetime_cols,
+        "rows": len(df_clean)
+    }
+
+    if not stream:
+        result = await run_in_threadpool(run_dashboard_pipeline, df_clean, numeric, categorical, datetime_cols, spec_dict)
+        return _json_safe({"summary": summary, **result})
+
+    def line(section, index, value):
+        return json.dumps(_json_safe({"section": section, "index": index, "result": value}), allow_nan=False) + "\n"
+
+    # sync generator: Starlette iterates it in a threadpool
+    def ndjson():
+        yield line("summary", None, summary)
+        for section, index, value in iter_dashboard_sections(df_clean, numeric, categorical, datetime_cols, spec_dict):
+            yield line(section, index, value)
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
 # ---------- NEW: Gemini agent endpoint ----------
 @app.post("/agent/analyze")
@@ -0,0 +1,208 @@
+# backend/pipeline.py
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .insights import generate_rule_based_insights, generate_llm_summary
+from .forecasting import forecast_time_series
+
+SPEC_KEYS = ("insights", "forecasts", "charts")
+CHART_TYPES = ("line", "bar", "pie", "scatter")
+# per-stage options and the positive-int options among them
+STAGE_OPTIONS = {
+    "insights": ("use_llm",),
+    "forecasts": ("date_col", "value_col", "periods"),
+    "charts": ("type", "x", "y", "color", "top"),
+}
+INT_OPTIONS = ("periods", "top")
+
+
+def validate_spec(spec):
+    """
+    Check a dashboard spec before any work is done.
+    Returns an error message, or None if the spec is usable.
+    """
+    if not isinstance(spec, dict):
+        return "expected a JSON object."
+    unknown = [k for k in spec if k not in SPEC_KEYS]
+    if unknown:
+        return f"unknown keys {unknown}. Allowed: {', '.join(SPEC_KEYS)}"
+    insights_opts = spec.get("insights")
+    if insights_opts is not None and not isinstance(insights_opts, dict):
+        return "'insights' must be an object or null."
+    for key in ("forecasts", "charts"):
+        items = spec.get(key)
+        if items is None:
+            continue
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            return f"'{key}' must be a list of objects or null."
+    for key, items in (("insights", [insights_opts] if insights_opts else []),
+                       ("forecasts", spec.get("forecasts") or []),
+                       ("charts", spec.get("charts") or [])):
+        for opts in items:
+            error = _validate_options(key, opts)
+            if error:
+                return error
+    return None
+
+
+def _validate_options(key, opts):
+    unknown = [k for k in opts if k not in STAGE_OPTIONS[key]]
+    if unknown:
+        return f"unknown {key} options {unknown}. Allowed: {', '.join(STAGE_OPTIONS[key])}"
+    for name, value in opts.items():
+        if value is None:
+            continue
+        if name == "use_llm":
+            if not isinstance(value, bool):
+                return "'use_llm' must be true or false."
+        elif name in INT_OPTIONS:
+            # bool is an int subclass; reject it explicitly
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                return f"'{name}' must be a positive integer."
+        elif not isinstance(value, str):
+            return f"'{name}' must be a string."
+    return None
+
+
+def default_spec(numeric, datetime_cols):
+    """
+    Spec used when the client sends none: rule-based insights, plus one forecast
+    on the default columns only when the file can actually be forecast.
+    """
+    spec = {"insights": {"use_llm": False}, "forecasts": [], "charts": []}
+    if numeric and datetime_cols:
+        spec["forecasts"].append({})
+    return spec
+
+
+def run_insights(df, numeric, categorical, datetime_cols, use_llm=False):
+    llm_text = None
+    if use_llm:
+        llm_text = generate_llm_summary(df)
+    return {"rule_based": generate_rule_based_insights(df, numeric, categorical, datetime_cols), "llm": llm_text}
+
+
+def run_forecast(df, numeric, datetime_cols, date_col=None, value_col=None, periods=6):
+    """
+    Forecast on the default date/numeric columns unless given.
+    Shared by /forecast and /dashboard so both return the same shape.
+    """
+    if not date_col and datetime_cols:
+        date_col = datetime_cols[0]
+    if not value_col and numeric:
+        value_col = numeric[0]
+    if not date_col or not value_col:
+        return {"error": "Need a date column and a numeric column to forecast."}
+    try:
+        hist, forecast_df = forecast_time_series(df, date_col, value_col, periods=periods)
+        return {
+            "historical": hist.to_dict(orient="records"),
+            "forecast": forecast_df.to_dict(orient="records")
+        }
+    except Exception as e:
+        return {"error": f"Forecast failed: {e}"}
+
+
+def aggregate_for_chart(df, numeric, chart_type, x_col, y_col, color_col=None, top=10):
+    """
+    Shape the frame for one chart.
+    bar: sum of y per x (and per color, if given), largest first.
+    pie: sum of y per x, the `top` largest; color is ignored.
+    line/scatter: raw x/y (and color) rows, line sorted by x.
+    y must be a numeric column.
+    """
+    if chart_type not in CHART_TYPES:
+        raise ValueError(f"Unsupported chart type '{chart_type}'. Allowed: {', '.join(CHART_TYPES)}")
+    for col in (x_col, y_col, color_col):
+        if col is not None and col not in df.columns:
+            raise ValueError(f"Unknown column '{col}'.")
+    if x_col is None or y_col is None:
+        raise ValueError("Both x and y columns are required.")
+    if y_col not in numeric:
+        raise ValueError(f"Column '{y_col}' is not numeric.")
+    if top < 1:
+        raise ValueError("top must be a positive integer.")
+    if chart_type == "pie":
+        color_col = None
+    cols = [x_col, y_col] + ([color_col] if color_col and color_col not in (x_col, y_col) else [])
+    if chart_type in ("line", "scatter"):
+        rows = df[cols].dropna(subset=[x_col, y_col])
+        if len(cols) == 3:
+            # keep rows with a blank color, like /upload's preview does
+            rows = rows.assign(**{color_col: rows[color_col].astype(object).where(rows[color_col].notna(), "")})
+        return rows.sort_values(x_col) if chart_type == "line" else rows
+    keys = [c for c in cols if c != y_col]
+    agg = df.groupby(keys)[y_col].sum().reset_index().sort_values(y_col, ascending=False)
+    if chart_type == "pie":
+        agg = agg.head(top)
+    return agg
+
+
+def run_chart(df, numeric, opts):
+    """
+    opts: one chart entry of the spec (type, x, y, color, top).
+    """
+    chart_type, x, y, color = opts.get("type", "bar"), opts.get("x"), opts.get("y"), opts.get("color")
+    try:
+        agg = aggregate_for_chart(df, numeric, chart_type, x, y, color_col=color, top=opts.get("top") or 10)
+    except Exception as e:
+        return {"error": f"Aggregation failed: {e}"}
+    return {"type": chart_type, "x": x, "y": y, "color": color, "data": agg.to_dict(orient="records")}
+
+
+def _drop_none(opts):
+    return {k: v for k, v in opts.items() if v is not None}
+
+
+def _build_tasks(df, numeric, categorical, datetime_cols, spec):
+    """
+    Turn a dashboard spec into (section, index, callable) tasks that all read the shared frame.
+    """
+    tasks = []
+    insights_opts = spec.get("insights")
+    if insights_opts is not None:
+        tasks.append(("insights", None, lambda: run_insights(df, numeric, categorical, datetime_cols, **_drop_none(insights_opts))))
+    for i, opts in enumerate(spec.get("forecasts") or []):
+        tasks.append(("forecasts", i, lambda opts=opts: run_forecast(df, numeric, datetime_cols, **_drop_none(opts))))
+    for i, opts in enumerate(spec.get("charts") or []):
+        tasks.append(("charts", i, lambda opts=opts: run_chart(df, numeric, opts)))
+    return tasks
+
+
+def iter_dashboard_sections(df, numeric, categorical, datetime_cols, spec=None, max_workers=4):
+    """
+    Run every stage of the spec concurrently on the already-parsed frame.
+    Yields (section, index, result) as each stage finishes; index is None for insights.
+    Stages never mutate df, so they can share it without copying.
+    """
+    if spec is None:
+        spec = default_spec(numeric, datetime_cols)
+    tasks = _build_tasks(df, numeric, categorical, datetime_cols, spec)
+    if not tasks:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as pool:
+        futures = {pool.submit(fn): (section, index) for section, index, fn in tasks}
+        for fut in as_completed(futures):
+            section, index = futures[fut]
+            try:
+                result = fut.result()
+            except Exception as e:
+                result = {"error": f"{section} failed: {e}"}
+            yield section, index, result
+
+
+def run_dashboard_pipeline(df, numeric, categorical, datetime_cols, spec=None, max_workers=4):
+    """
+    Collect all stage results into one response dict, keeping forecasts/charts in spec order.
+    """
+    if spec is None:
+        spec = default_spec(numeric, datetime_cols)
+    result = {
+        "insights": None,
+        "forecasts": [None] * len(spec.get("forecasts") or []),
+        "charts": [None] * len(spec.get("charts") or []),
+    }
+    for section, index, value in iter_dashboard_sections(df, numeric, categorical, datetime_cols, spec, max_workers):
+        if index is None:
+            result[section] = value
+        else:
+            result[section][index] = value
+    return result
@@ -0,0 +1,67 @@
+# tests/test_api.py
+import json
+import pytest
+from fastapi.testclient import TestClient
+from backend.api import app
+
+client = TestClient(app)
+
+# 12 daily rows with a blank Region and a blank Sales cell
+CSV = "Date,Region,Sales\n" + "".join(
+    f"2024-01-{i + 1:02d},{'' if i == 4 else 'R' + str(i % 3)},{'' if i == 7 else i * 10}\n" for i in range(12)
+)
+SPEC = json.dumps({
+    "insights": {},
+    "forecasts": [{"periods": 3}],
+    "charts": [
+        {"type": "line", "x": "Date", "y": "Sales", "color": "Region"},
+        {"type": "bar", "x": "Region", "y": "Sales"},
+    ],
+})
+
+
+def post_dashboard(**data):
+    return client.post("/dashboard", files={"file": ("sales.csv", CSV.encode())}, data=data)
+
+
+def test_dashboard_single_response():
+    resp = post_dashboard(spec=SPEC)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["summary"]["rows"] == 12 and body["summary"]["datetime"] == ["Date"]
+    assert body["insights"]["rule_based"]
+    assert len(body["forecasts"][0]["forecast"]) == 3
+    line, bar = body["charts"]
+    assert "" in [row["Region"] for row in line["data"]]
+    assert len(line["data"]) == 11
+    assert {row["Region"] for row in bar["data"]} == {"R0", "R1", "R2"}
+
+
+def test_dashboard_stream_lines_are_json():
+    resp = post_dashboard(spec=SPEC, stream="true")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert all(set(line) == {"section", "index", "result"} for line in lines)
+    assert lines[0]["section"] == "summary" and lines[0]["index"] is None
+    sections = sorted((line["section"], line["index"] if line["index"] is not None else -1) for line in lines[1:])
+    assert sections == [("charts", 0), ("charts", 1), ("forecasts", 0), ("insights", -1)]
+
+
+def test_dashboard_default_spec():
+    body = post_dashboard().json()
+    assert len(body["forecasts"]) == 1 and "forecast" in body["forecasts"][0]
+    assert body["charts"] == []
+
+
+@pytest.mark.parametrize("spec, message", [
+    ("{not json", "Invalid spec"),
+    ('{"forecasts": 5}', "'forecasts' must be a list"),
+    ('{"chart": []}', "unknown keys"),
+    ('{"insights": {"use_llm": "yes"}}', "'use_llm' must be true or false"),
+    ('{"forecasts": [{"periods": "3"}]}', "'periods' must be a positive integer"),
+    ('{"charts": [{"type": "pie", "x": "Region", "y": "Sales", "top": -2}]}', "'top' must be a positive integer"),
+])
+def test_dashboard_invalid_spec(spec, message):
+    body = post_dashboard(spec=spec).json()
+    assert body["error"].startswith("Invalid spec") and message in body["error"]
@@ -0,0 +1,108 @@
+# tests/test_pipeline.py
+import pandas as pd
+import pytest
+from backend.data_processing import detect_column_types
+from backend.pipeline import (
+    validate_spec,
+    default_spec,
+    aggregate_for_chart,
+    iter_dashboard_sections,
+    run_dashboard_pipeline,
+)
+
+
+@pytest.fixture
+def frame():
+    df = pd.DataFrame({
+        "Date": pd.date_range("2024-01-01", periods=12, freq="D").strftime("%Y-%m-%d"),
+        "Region": ["North", "South", "East"] * 4,
+        "Sales": [10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 110, 120],
+    })
+    return detect_column_types(df)
+
+
+def test_validate_spec():
+    assert validate_spec({}) is None
+    assert validate_spec({"insights": None, "forecasts": [{}], "charts": []}) is None
+    assert validate_spec([]) is not None
+    assert validate_spec({"forecasts": 5}) is not None
+    assert validate_spec({"charts": True}) is not None
+    assert validate_spec({"charts": [1]}) is not None
+    assert validate_spec({"insights": []}) is not None
+    assert "chart" in validate_spec({"chart": []})
+    assert validate_spec({"insights": {"use_llm": True}, "forecasts": [{"periods": 3}], "charts": [{"top": 5}]}) is None
+    assert validate_spec({"insights": {"use_llm": "yes"}}) is not None
+    assert validate_spec({"forecasts": [{"periods": "3"}]}) is not None
+    assert validate_spec({"forecasts": [{"periods": True}]}) is not None
+    assert validate_spec({"forecasts": [{"period": 3}]}) is not None
+    assert validate_spec({"charts": [{"top": 0}]}) is not None
+    assert validate_spec({"charts": [{"x": 1}]}) is not None
+
+
+def test_default_spec_skips_forecast_without_dates():
+    assert default_spec(["Sales"], ["Date"])["forecasts"] == [{}]
+    assert default_spec(["Sales"], [])["forecasts"] == []
+    assert default_spec([], ["Date"])["forecasts"] == []
+
+
+def test_aggregate_for_chart(frame):
+    numeric, _, _, df = frame
+    bar = aggregate_for_chart(df, numeric, "bar", "Region", "Sales")
+    assert bar["Region"].tolist() == ["East", "South", "North"]
+    assert bar["Sales"].tolist() == [300, 260, 220]
+    pie = aggregate_for_chart(df, numeric, "pie", "Region", "Sales", color_col="Region", top=2)
+    assert pie["Region"].tolist() == ["East", "South"]
+    line = aggregate_for_chart(df, numeric, "line", "Date", "Sales", color_col="Region")
+    assert list(line.columns) == ["Date", "Sales", "Region"]
+    assert len(line) == 12 and line["Date"].is_monotonic_increasing
+    with pytest.raises(ValueError, match="top must be"):
+        aggregate_for_chart(df, numeric, "pie", "Region", "Sales", top=-2)
+    with pytest.raises(ValueError, match="not numeric"):
+        aggregate_for_chart(df, numeric, "bar", "Sales", "Region")
+    with pytest.raises(ValueError, match="Unknown column"):
+        aggregate_for_chart(df, numeric, "bar", "Missing", "Sales")
+    with pytest.raises(ValueError, match="Unsupported chart type"):
+        aggregate_for_chart(df, numeric, "area", "Region", "Sales")
+
+
+def test_aggregate_for_chart_fills_blank_color(frame):
+    numeric, _, _, df = frame
+    df = df.copy()
+    df.loc[4, "Region"] = None
+    scatter = aggregate_for_chart(df, numeric, "scatter", "Date", "Sales", color_col="Region")
+    assert len(scatter) == 12 and scatter.loc[4, "Region"] == ""
+    assert pd.isna(df.loc[4, "Region"])
+
+
+def test_pipeline_keeps_spec_order_and_isolates_errors(frame):
+    numeric, categorical, datetime_cols, df = frame
+    spec = {
+        "insights": {},
+        "forecasts": [{"periods": 3}, {"value_col": "Missing"}, {"periods": 2}],
+        "charts": [{"type": "bar", "x": "Region", "y": "Sales"}, {"type": "bar", "x": "Region", "y": "Region"}],
+    }
+    result = run_dashboard_pipeline(df, numeric, categorical, datetime_cols, spec)
+    assert result["insights"]["rule_based"] and result["insights"]["llm"] is None
+    first, broken, last = result["forecasts"]
+    assert len(first["forecast"]) == 3 and len(last["forecast"]) == 2
+    assert broken["error"].startswith("Forecast failed")
+    assert len(result["charts"][0]["data"]) == 3
+    assert result["charts"][1]["error"].startswith("Aggregation failed")
+
+
+def test_pipeline_bad_stage_options_do_not_abort(frame):
+    numeric, categorical, datetime_cols, df = frame
+    spec = {"forecasts": [{"period": 3}], "charts": [{"type": "bar", "x": "Region", "y": "Sales"}]}
+    sections = list(iter_dashboard_sections(df, numeric, categorical, datetime_cols, spec))
+    by_section = {section: result for section, _, result in sections}
+    assert "error" in by_section["forecasts"]
+    assert "data" in by_section["charts"]
+
+
+def test_pipeline_default_spec_without_dates():
+    numeric, categorical, datetime_cols, df = detect_column_types(
+        pd.DataFrame({"Region": ["a", "b", "a"], "Sales": [1, 2, 3]})
+    )
+    result = run_dashboard_pipeline(df, numeric, categorical, datetime_cols)
+    assert result["forecasts"] == [] and result["charts"] == []
+    assert result["insights"]["rule_based"]